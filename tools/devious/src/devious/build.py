@@ -10,7 +10,7 @@ logger = logging.getLogger()
 
 
 @click.command()
-@click.option("--clean", is_flag=True, default=False)
+@click.option("--clean", is_flag=True, default=False, help="Clean build dir first (webapps always build clean).")
 @click.option("--target", type=str, required=True)
 def build(clean: bool, target: str) -> None:
     """Build software."""
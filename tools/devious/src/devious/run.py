@@ -1,11 +1,15 @@
 """Run apps."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import click
 
 from devious import registration
 
 
 @click.command
-@click.option("--target", type=str, required=True)
-def run(target: str) -> None:
-    registration.find_target(target).run()
+@click.option("--target", type=str, required=True, multiple=True, help="Target to run, can be given multiple times.")
+def run(target: tuple[str, ...]) -> None:
+    found_targets = [registration.find_target(target_name) for target_name in target]
+    with ThreadPoolExecutor(max_workers=min(32, len(found_targets))) as executor:
+        list(executor.map(lambda found_target: found_target.run(), found_targets))
@@ -16,6 +16,9 @@ from devious.wrappers import docker, linux, ssh
 
 APP_CONFIG_DIR = Path(__file__).parent / "config"
 
+_YAML = ruamel.yaml.YAML(typ="safe")
+_YAML.default_flow_style = False
+
 logger = logging.getLogger()
 
 
@@ -70,7 +73,7 @@ class DjangoApp(Target):
         subprocess.run(
             [str(dev_django_manager), "runserver", "--settings", f"{target_name}.debug_settings"], check=True
         )
-        ruamel.yaml.YAML().dump(
+        _YAML.dump(
             {"services": {target_name: {"build": {"context": ".", "network": "host"}, "ports": None}}},
             docker_compose_file,
         )
@@ -106,7 +109,7 @@ class DjangoApp(Target):
 
         with utils.temp_env(
             app_name=self.target_name,
-            exposed_ports=" ".join(str(docker_port) for _, docker_port in self.bind_ports.items()),
+            exposed_ports=" ".join(map(str, self.bind_ports.values())),
             application_port=str(self.application_port),
             deployment_dir=self.deployment_dir.as_posix(),
             domain_name=self.domain_name,
@@ -191,12 +194,11 @@ def copy_files_with_substitution(template_dir: Path, target_dir: Path) -> None:
 
 def configure_compose(dir: Path, app_name: str, app_docker_ports: dict[int, int]) -> None:
     docker_compose_file = dir / "docker-compose.yaml"
-    yaml = ruamel.yaml.YAML()
-    data = yaml.load(docker_compose_file)
+    data = _YAML.load(docker_compose_file)
     data["services"][app_name].update(
-        {"ports": [f"{str(host_port)}:{str(docker_port)}" for host_port, docker_port in app_docker_ports.items()]}
+        {"ports": [f"{host_port}:{docker_port}" for host_port, docker_port in app_docker_ports.items()]}
     )
-    yaml.dump(data, docker_compose_file)
+    _YAML.dump(data, docker_compose_file)
 
 
 def set_up_ssl_cert(
@@ -11,7 +11,7 @@ from devious import utils
 from devious.config import REPO_CONFIG
 from devious.targets import target
 from devious.targets.target import Target
-from devious.wrappers import docker, linux, pytest, ssh
+from devious.wrappers import docker, linux, pip, pytest, ssh
 
 MICROSERVICE_CONFIG_DIR = Path(__file__).parent / "microservice_config/"
 NGINX_CONFIG_DIR = Path(__file__).parent / "nginx_config/"
@@ -61,16 +61,10 @@ class Microservice(Target):
     def verify(self) -> bool:
         if super().verify():
             return True
-        if not next(
-            self.target_dir.glob("requirements.txt"),
-            None,  # pyright: ignore [reportGeneralTypeIssues]
-        ):
+        if not (self.target_dir / "requirements.txt").is_file():
             logger.error("No Python requirements specified.")
             return True
-        if not next(
-            self.target_dir.glob("Dockerfile"),
-            None,  # pyright: ignore [reportGeneralTypeIssues]
-        ):
+        if not (self.target_dir / "Dockerfile").is_file():
             logger.error("No Dockerfile.")
             return True
         if not self.target_src_dir.is_dir():
@@ -143,9 +137,10 @@ class Microservice(Target):
             session.run(["service", "nginx", "start"])
 
     def debug(self) -> None:
-        subprocess.run(["pip", "install", "-r", (self.target_dir / "requirements.txt").as_posix()])
+        pip.install_requirements(
+            self.target_dir / "requirements.txt", REPO_CONFIG.build_dir / ".pip" / f"{self.target_name}.sha256"
+        )
         # TODO: Ask which debug mode
-        subprocess.run(["fastapi", "dev", self.target_src_dir / "main.py"])
         subprocess.run(
             [
                 "uvicorn",
@@ -1,12 +1,14 @@
+import copy
 import logging
 import os
 import shutil
 import string
 import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path, PurePath
+from typing import Iterator
 
-import ruamel.yaml
+import yaml
 
 from devious import utils
 from devious.config import REPO_CONFIG
@@ -14,9 +16,39 @@ from devious.targets import target
 from devious.targets.target import Target
 from devious.wrappers import docker, linux, pytest, ssh
 
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # pyright: ignore [reportGeneralTypeIssues]
+
 WEBAPP_CONFIG_DIR = Path(__file__).parent / "webapp_config/"
 NGINX_CONFIG_DIR = Path(__file__).parent / "nginx_config/"
 
+COMPOSE_SERVICE_TEMPLATE = {"build": {"context": ".", "network": "host"}, "ports": None}
+SSL_CERT_CMD = linux.chain_commands(
+    [
+        linux.apt_get_install(["python3", "python3-venv", "libaugeas0"]),
+        ["python3", "-m", "venv", "/opt/certbot/"],
+        ["/opt/certbot/bin/pip", "install", "--upgrade", "pip"],
+        ["/opt/certbot/bin/pip", "install", "certbot", "certbot-nginx"],
+        ["ln", "-s", "/opt/certbot/bin/certbot", "/usr/bin/certbot"],
+        ["pkill", "nginx"],
+        [
+            "certbot",
+            "--nginx",
+            "--agree-tos",
+            "--test-cert",  # TODO: Get full cert
+            "--non-interactive",
+            "--email",
+            "$email",
+            "-d",
+            "$domain_name",
+        ],
+        ["pkill", "nginx"],
+    ],
+    operator=";",
+)
+
 logger = logging.getLogger()
 
 
@@ -59,25 +91,23 @@ class Webapp(Target):
         target_tests_dir.mkdir(parents=True)
         target.extend_pythonpath(target_src_dir.parent)
         docker_compose_file = target_dir / "docker-compose.yaml"
-        ruamel.yaml.YAML().dump(
-            {"services": {target_name: {"build": {"context": ".", "network": "host"}, "ports": None}}},
-            docker_compose_file,
-        )
+        with docker_compose_file.open("w") as compose_file:
+            yaml.dump(
+                {"services": {target_name: copy.deepcopy(COMPOSE_SERVICE_TEMPLATE)}},
+                compose_file,
+                Dumper=SafeDumper,
+                sort_keys=False,
+                default_flow_style=False,
+            )
         logger.info("Your target %s was set up, please register it in registered_targets.py.", target_name)
 
     def verify(self) -> bool:
         if super().verify():
             return True
-        if not next(
-            self.target_dir.glob("requirements.txt"),
-            None,  # pyright: ignore [reportGeneralTypeIssues]
-        ):
+        if not (self.target_dir / "requirements.txt").is_file():
             logger.error("No Python requirements specified.")
             return True
-        if not next(
-            self.target_dir.glob("Dockerfile"),
-            None,  # pyright: ignore [reportGeneralTypeIssues]
-        ):
+        if not (self.target_dir / "Dockerfile").is_file():
             logger.error("No Dockerfile.")
             return True
         if not self.target_src_dir.is_dir():
@@ -86,14 +116,9 @@ class Webapp(Target):
         return False
 
     def build(self, clean: bool = True) -> None:
-        """Build webapp as Docker container."""
+        """Build webapp as Docker container, always into a fresh build dir."""
         shutil.rmtree(self.target_build_dir, ignore_errors=True)
-        try:
-            shutil.copytree(self.target_src_dir.parent, self.app_build_dir)
-            shutil.copy(self.target_dir / "docker-compose.yaml", self.target_build_dir)
-        except FileExistsError:
-            logger.error("%s exists already. To overwrite, build --clean.", self.target_build_dir)
-            sys.exit(1)
+        shutil.copytree(self.target_src_dir.parent, self.app_build_dir, copy_function=_link_or_copy)
 
         with utils.temp_env(
             target_name=self.target_name,
@@ -101,30 +126,50 @@ class Webapp(Target):
             deployment_dir=self.deployment_dir.as_posix(),
             domain_name=self.domain_name,
             all_caps=True,
-        ):
-            copy_files_with_substitution(WEBAPP_CONFIG_DIR, self.target_build_dir)
-            copy_files_with_substitution(NGINX_CONFIG_DIR, self.target_build_dir / "nginx_config")
-            configure_compose(self.target_build_dir, self.target_name, {self.application_port: self.application_port})
+        ) as env:
+            copy_files_with_substitution(WEBAPP_CONFIG_DIR, self.target_build_dir, env)
+            copy_files_with_substitution(NGINX_CONFIG_DIR, self.target_build_dir / "nginx_config", env)
+        with (self.target_dir / "docker-compose.yaml").open("rb") as compose_file:
+            compose = yaml.load(compose_file, Loader=SafeLoader)
+        configure_compose(compose, self.target_name, {self.application_port: self.application_port})
+        with (self.target_build_dir / "docker-compose.yaml").open("w") as compose_file:
+            yaml.dump(compose, compose_file, Dumper=SafeDumper, sort_keys=False, default_flow_style=False)
 
     def test(self, coverage: bool) -> bool:
         coverage_dir = REPO_CONFIG.metrics_dir / "pytest-coverage" / self.target_name
         return pytest.test_directory(REPO_CONFIG.project_root, out_dir=coverage_dir, coverage=coverage, vis=False)
 
     def deploy(self) -> None:
+        steps = [
+            linux.if_command_missing("docker", docker.install_docker()),
+            linux.if_command_missing("python", linux.apt_get_install(["python-is-python3"])),
+            linux.if_command_missing(
+                "nginx",
+                linux.chain_commands(
+                    [
+                        linux.apt_get_install(["nginx"]),
+                        ["rm", "/etc/nginx/sites-available/default"],
+                        ["rm", "/etc/nginx/sites-enabled/default"],
+                    ],
+                    operator=";",
+                ),
+            ),
+            ["cp", "-r", (self.deployment_dir / "nginx_config").as_posix() + "/.", "/etc/nginx/"],
+            docker.docker_compose_build(self.deployed_docker_compose_yaml),
+            set_up_ssl_cert(domain_name=self.domain_name, email=self.email),
+            ["service", "nginx", "reload"],
+        ]
         with ssh.SSHSession(self.domain_name) as session:
-            if session.run(["command", "-v", "docker", ">/dev/null 2>&1"]):
-                session.run(docker.install_docker())
-            if session.run(["command", "-v", "python", ">/dev/null 2>&1"]):
-                session.run(linux.apt_get_install(["python-is-python3"]))
-            if session.run(["command", "-v", "nginx", ">/dev/null 2>&1"]):
-                session.run(linux.apt_get_install(["nginx"]))
-                session.run(["rm", "/etc/nginx/sites-available/default"])
-                session.run(["rm", "/etc/nginx/sites-enabled/default"])
-            session.upload(self.target_build_dir, self.deployment_dir)
-            session.run(["cp", "-r", (self.deployment_dir / "nginx_config").as_posix() + "/.", "/etc/nginx/"])
-            session.run(docker.docker_compose_build(self.deployed_docker_compose_yaml))
-            session.run(set_up_ssl_cert(domain_name=self.domain_name, email=self.email))
-            session.run(["service", "nginx", "reload"])
+            ssh.upload_tree_rsync(session, self.target_build_dir, self.deployment_dir)
+            session.run(linux.chain_commands(steps, operator=";"))
+
+    @classmethod
+    def deploy_many(cls, webapps: list["Webapp"]) -> None:
+        """Deploy several webapps concurrently, each over its own SSH session."""
+        if not webapps:
+            return
+        with ThreadPoolExecutor(max_workers=min(32, len(webapps))) as executor:
+            list(executor.map(lambda webapp: webapp.deploy(), webapps))
 
     def run(self) -> None:
         with ssh.SSHSession(self.domain_name) as session:
@@ -139,7 +184,6 @@ class Webapp(Target):
             docker.docker_compose_build(self.target_build_dir / "docker-compose.yaml")
             docker.docker_compose_up(self.target_build_dir / "docker-compose.yaml")
         else:
-            subprocess.run(["fastapi", "dev", self.target_src_dir / "main.py"])
             subprocess.run(
                 [
                     "uvicorn",
@@ -158,53 +202,60 @@ class Webapp(Target):
             session.run(docker.docker_compose_stop(docker_compose_yaml=self.deployed_docker_compose_yaml))
 
 
-def copy_files_with_substitution(template_dir: Path, target_dir: Path) -> None:
-    """Copy a file with string substitution."""
+def _walk(root: str) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield all entries below root, reusing the file type cached by scandir."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+
+
+def copy_files_with_substitution(template_dir: Path, target_dir: Path, env: dict[str, str]) -> None:
+    """Copy a file with string substitution of the variables in env."""
     target_dir.mkdir(parents=True, exist_ok=True)
-    for template in template_dir.rglob("*"):
-        if template.is_dir():
-            (target_dir / template.relative_to(template_dir)).mkdir(parents=True, exist_ok=True)
-            continue
-        (target_dir / template.relative_to(template_dir)).write_text(
-            string.Template(template.read_text()).substitute(os.environ)
-        )
-
-
-def configure_compose(dir: Path, app_name: str, app_docker_ports: dict[int, int]) -> None:
-    docker_compose_file = dir / "docker-compose.yaml"
-    yaml = ruamel.yaml.YAML()
-    data = yaml.load(docker_compose_file)
-    data["services"][app_name].update(
-        {"ports": [f"{str(host_port)}:{str(docker_port)}" for host_port, docker_port in app_docker_ports.items()]}
+    base_len = len(str(template_dir)) + 1
+    target_base = str(target_dir)
+    templates = []
+    for entry in _walk(str(template_dir)):
+        target_path = os.path.join(target_base, entry.path[base_len:])
+        if entry.is_dir(follow_symlinks=False):
+            os.makedirs(target_path, exist_ok=True)
+        else:
+            templates.append((entry.path, target_path))
+
+    def substitute(paths: tuple[str, str]) -> None:
+        template_path, target_path = paths
+        with open(template_path, "rb") as template_file:
+            data = template_file.read()
+        if b"$" in data:
+            data = string.Template(data.decode()).substitute(env).encode()
+        with open(target_path, "wb") as target_file:
+            target_file.write(data)
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        list(executor.map(substitute, templates))
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, falling back to a full copy e.g. across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def configure_compose(compose: dict, app_name: str, app_docker_ports: dict[int, int]) -> dict:
+    """Set the port bindings of the app service in a docker compose dict."""
+    compose["services"][app_name].update(
+        {"ports": [f"{host_port}:{docker_port}" for host_port, docker_port in app_docker_ports.items()]}
     )
-    yaml.dump(data, docker_compose_file)
+    return compose
 
 
 def set_up_ssl_cert(domain_name: str, email: str) -> list[str]:
-    certbot_cmd = [
-        "certbot",
-        "--nginx",
-        "--agree-tos",
-        "--test-cert",  # TODO: Get full cert
-        "--non-interactive",
-        "--email",
-        email,
-        "-d",
-        domain_name,
-    ]
-    return linux.chain_commands(
-        [
-            linux.apt_get_install(["python3", "python3-venv", "libaugeas0"]),
-            ["python3", "-m", "venv", "/opt/certbot/"],
-            ["/opt/certbot/bin/pip", "install", "--upgrade", "pip"],
-            ["/opt/certbot/bin/pip", "install", "certbot", "certbot-nginx"],
-            ["ln", "-s", "/opt/certbot/bin/certbot", "/usr/bin/certbot"],
-            ["pkill", "nginx"],
-            certbot_cmd,
-            ["pkill", "nginx"],
-        ],
-        operator=";",
-    )
+    slots = {"$email": email, "$domain_name": domain_name}
+    return [slots.get(token, token) for token in SSL_CERT_CMD]
 
 
 def example_main_py():
@@ -31,14 +31,14 @@ def wait_for_callable(callable_object: Callable[[], NoReturn]) -> Generator[None
 
 
 @contextmanager
-def temp_env(all_caps: bool = False, **kwargs: str) -> Generator[None, Any, None]:
-    """Temporary set environment variables, e.g. for expansion in templates."""
+def temp_env(all_caps: bool = False, **kwargs: str) -> Generator[dict[str, str], Any, None]:
+    """Temporary set environment variables, e.g. for expansion in templates, and yield the variables set."""
     if all_caps:
         kwargs = {key.upper(): value for key, value in kwargs.items()}
     old = dict(os.environ)
     os.environ.update(**kwargs)
     try:
-        yield
+        yield kwargs
     finally:
         os.environ.clear()
         os.environ.update(old)
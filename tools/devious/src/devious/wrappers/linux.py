@@ -8,6 +8,11 @@ def chain_commands(commands: list[list[str]], operator: str = "&&") -> list[str]
     return chained_command
 
 
+def if_command_missing(command: str, commands: list[str]) -> list[str]:
+    """Run commands only if command is not available on the PATH."""
+    return ["command", "-v", command, ">/dev/null", "2>&1", "||", "{", *commands, ";", "}"]
+
+
 def apt_get_install(apps: list[str]) -> list[str]:
     cmd = ["export", "DEBIAN_FRONTEND=noninteractive" "&&" "apt-get", "update", "&&", "apt-get", "install", "--yes"]
     cmd.extend(apps)
@@ -0,0 +1,24 @@
+"""Wrapper for pip cli."""
+
+import hashlib
+import logging
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger()
+
+
+def install_requirements(requirements_file: Path, marker_file: Path) -> None:
+    """Install requirements with pip, skip if unchanged since the install recorded in marker_file."""
+    if not requirements_file.is_file():
+        logger.warning("No %s found, skipping pip install.", requirements_file)
+        return
+    digest = hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+    if marker_file.is_file() and marker_file.read_text() == digest:
+        logger.debug("%s unchanged since last install, skipping.", requirements_file)
+        return
+    if subprocess.run(["pip", "install", "-r", requirements_file.as_posix()]).returncode:
+        logger.error("Failed to install %s.", requirements_file)
+        return
+    marker_file.parent.mkdir(parents=True, exist_ok=True)
+    marker_file.write_text(digest)
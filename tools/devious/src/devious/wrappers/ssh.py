@@ -2,6 +2,8 @@
 
 import logging
 import os
+import shlex
+import shutil
 import subprocess
 from pathlib import Path, PurePath
 
@@ -22,6 +24,8 @@ def run_command(target: str, command: str, user: str = "root") -> None:
 
 class SSHSession:
     def __init__(self, ip_address: str, user: str = "root") -> None:
+        self.ip_address = ip_address
+        self.user = user
         self.client = SSHClient()
         self.client.set_missing_host_key_policy(WarningPolicy())  # TODO: Is this safe?
         self.client.load_system_host_keys()
@@ -63,4 +67,35 @@ class SSHSession:
                         )
 
 
+def upload_tree_rsync(session: SSHSession, src: Path, dest_dir: PurePath) -> None:
+    """Mirror a local directory to the remote host in a single stream, preferring rsync over tar."""
+    remote = shlex.quote(dest_dir.as_posix())
+    if shutil.which("rsync"):
+        returncode = subprocess.run(
+            [
+                "rsync",
+                "-az",
+                "--delete",
+                "-e",
+                f"ssh -l {session.user}",
+                "--rsync-path",
+                f"mkdir -p {remote} && rsync",
+                f"{src.as_posix()}/",
+                f"{session.ip_address}:{dest_dir.as_posix()}/",
+            ]
+        ).returncode
+        if not returncode:
+            return
+        logger.warning("rsync upload to %s failed, falling back to tar over ssh.", session.ip_address)
+    subprocess.run(
+        [
+            "bash",
+            "-c",
+            f"tar -C {shlex.quote(src.as_posix())} -cz . | ssh -l {session.user} {session.ip_address} "
+            + shlex.quote(f"rm -rf {remote} && mkdir -p {remote} && tar -C {remote} -xz"),
+        ],
+        check=True,
+    )
+
+
 # TODO: Check server for vulnerabilites, e.g. password authentication not no in /etc/ssh/sshd_config
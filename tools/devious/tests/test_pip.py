@@ -0,0 +1,41 @@
+"""Tests for pip wrapper."""
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+from devious.wrappers import pip
+
+
+def test_install_requirements_skips_unchanged(tmp_path: Path) -> None:
+    """Test that pip only runs again after requirements changed."""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("click\n")
+    marker = tmp_path / "markers" / "reqs.sha256"
+    completed = subprocess.CompletedProcess(args=[], returncode=0)
+    with mock.patch.object(pip.subprocess, "run", return_value=completed) as run:
+        pip.install_requirements(requirements, marker)
+        pip.install_requirements(requirements, marker)
+        assert run.call_count == 1
+        requirements.write_text("click\nregex\n")
+        pip.install_requirements(requirements, marker)
+        assert run.call_count == 2
+
+
+def test_install_requirements_failure_not_recorded(tmp_path: Path) -> None:
+    """Test that a failed install is retried on the next call."""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("click\n")
+    marker = tmp_path / "reqs.sha256"
+    failed = subprocess.CompletedProcess(args=[], returncode=1)
+    with mock.patch.object(pip.subprocess, "run", return_value=failed) as run:
+        pip.install_requirements(requirements, marker)
+        pip.install_requirements(requirements, marker)
+        assert run.call_count == 2
+    assert not marker.exists()
+
+
+def test_install_requirements_missing_file(tmp_path: Path) -> None:
+    """Test that a missing requirements file is skipped without running pip."""
+    with mock.patch.object(pip.subprocess, "run") as run:
+        pip.install_requirements(tmp_path / "requirements.txt", tmp_path / "reqs.sha256")
+    run.assert_not_called()
@@ -25,6 +25,7 @@ def test_temp_env() -> None:
         os.environ["test2"] = "test_variable"
         assert os.environ.get("test2") == "test_variable"
     assert old_env == dict(os.environ)
-    with utils.temp_env(all_caps=True, test="test_variable"):
+    with utils.temp_env(all_caps=True, test="test_variable") as env:
+        assert env == {"TEST": "test_variable"}
         assert os.environ.get("TEST") == "test_variable"
         assert "test" not in os.environ
@@ -0,0 +1,17 @@
+"""Tests for webapp target."""
+from unittest import mock
+
+from devious.targets.webapp.webapp import Webapp
+
+
+def test_deploy_many() -> None:
+    """Test that every webapp is deployed exactly once."""
+    webapps = [mock.Mock(spec=Webapp) for _ in range(3)]
+    Webapp.deploy_many(webapps)
+    for webapp in webapps:
+        webapp.deploy.assert_called_once_with()
+
+
+def test_deploy_many_empty() -> None:
+    """Test that deploying no webapps is a no-op."""
+    Webapp.deploy_many([])